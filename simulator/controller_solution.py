@@ -1,3 +1,6 @@
+import numpy as np
+
+
 class Controller:
     def __init__(self):
         self.integral_term_sum = 0
@@ -14,4 +17,30 @@ class Controller:
 
         self.prev_error = error
 
-        return p_term + i_term + d_term
\ No newline at end of file
+        return p_term + i_term + d_term
+
+
+class BatchController:
+    """
+    The same PID law as Controller, evaluated for n independent loops at once.
+    The integral and previous-error state of every loop is kept in NumPy
+    arrays; setpoints, measurements and gains may be scalars or arrays of
+    length n.
+    """
+
+    def __init__(self, n):
+        self.integral_term_sum = np.zeros(n)
+        self.prev_error = np.zeros(n)
+
+    def get_control_output(self, setpoint, current_position, dt, k_p, k_i, k_d):
+        error = np.asarray(setpoint, dtype="float64") - current_position
+        self.integral_term_sum += k_i * error * dt
+        derivative = (error - self.prev_error) / dt
+
+        p_term = k_p * error
+        i_term = self.integral_term_sum
+        d_term = k_d * derivative
+
+        self.prev_error = error
+
+        return p_term + i_term + d_term
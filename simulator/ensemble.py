@@ -0,0 +1,130 @@
+import numpy as np
+
+
+class SpringMassDamperEnsemble:
+    """
+    N independent spring-mass-damper plants stepped together.
+
+    Each plant has the same dynamics as SpringMassDamperModel, but the
+    parameters and the state are stored as one NumPy array per quantity
+    (struct-of-arrays), so a whole ensemble advances in a handful of
+    vectorized operations instead of a Python loop per plant.
+
+    Every parameter may be a scalar (shared by all plants) or an array of
+    length N. If all of them are scalars, pass n to set the ensemble size.
+    """
+
+    def __init__(
+        self,
+        mass,
+        k_spring,
+        max_spring_force_N,
+        b_damper,
+        midpos_m,
+        control_saturation,
+        n=None,
+    ):
+        params = np.broadcast_arrays(
+            *[
+                np.asarray(p, dtype="float64")
+                for p in (
+                    mass,
+                    k_spring,
+                    max_spring_force_N,
+                    b_damper,
+                    midpos_m,
+                    control_saturation,
+                )
+            ]
+        )
+        size = params[0].size if params[0].ndim > 0 else 1
+        if n is None:
+            n = size
+        elif params[0].ndim > 0 and size != n:
+            raise ValueError(f"Parameter arrays have length {size}, expected {n}")
+
+        (
+            self.mass,  # kg
+            self.k_spring,  # N/m
+            self.max_spring_force_N,
+            self.b_damper,  # N/(m/s)
+            self.midpos_m,
+            self.control_saturation,  # N
+        ) = [np.array(np.broadcast_to(p, (n,))) for p in params]
+        self.n = n
+
+        # Row 0 holds the displacement from midpos_m, row 1 the velocity,
+        # so each quantity is contiguous across the ensemble.
+        self.x = np.zeros((2, n))
+
+    def compute_non_linear_spring_constant(self):
+        delta_pos = np.abs(self.get_position() - self.midpos_m)
+        non_clamped_spring_force = self.k_spring * delta_pos
+        clamped_spring_force = np.clip(
+            non_clamped_spring_force, -self.max_spring_force_N, self.max_spring_force_N
+        )
+
+        eff_spring_constant = np.zeros(self.n)
+        np.divide(
+            clamped_spring_force,
+            delta_pos,
+            out=eff_spring_constant,
+            where=delta_pos != 0,
+        )
+        return eff_spring_constant
+
+    def compute_new_position(self, force, dt, num_steps=500):
+        """
+        Advance every plant by dt using num_steps forward Euler substeps.
+
+        Within a frame the spring constant and the force are frozen, so each
+        Euler substep is the same affine map x <- M x + g. Instead of looping,
+        the num_steps-fold composition M^n x + (I + M + ... + M^(n-1)) g is
+        built by repeated squaring, which costs O(log num_steps) vectorized
+        operations and gives the same result as the substep loop.
+        :param force: scalar or array of length N, clipped per plant
+        :param dt: frame duration in seconds
+        :return: array of the N new positions
+        """
+        force = np.clip(force, -self.control_saturation, self.control_saturation)
+        eff_spring_constant = self.compute_non_linear_spring_constant()
+        h = dt / num_steps
+
+        # Single Euler substep: M = I + A*h, g = B*force*h. Matrices are
+        # stacked as (2, 2, N) so each product is one contiguous einsum.
+        identity = np.broadcast_to(np.eye(2)[:, :, np.newaxis], (2, 2, self.n))
+        step = np.empty((2, 2, self.n))
+        step[0, 0] = 1
+        step[0, 1] = h
+        step[1, 0] = -eff_spring_constant / self.mass * h
+        step[1, 1] = 1 - self.b_damper / self.mass * h
+
+        power = identity
+        geometric_sum = np.zeros((2, 2, self.n))
+        base_power = step
+        base_sum = identity
+        remaining = num_steps
+        while remaining:
+            if remaining & 1:
+                geometric_sum = geometric_sum + _matmul(power, base_sum)
+                power = _matmul(power, base_power)
+            remaining >>= 1
+            if remaining:
+                base_sum = base_sum + _matmul(base_power, base_sum)
+                base_power = _matmul(base_power, base_power)
+
+        forcing = force / self.mass * h
+        self.x = np.einsum("ijn,jn->in", power, self.x) + geometric_sum[:, 1] * forcing
+
+        return self.get_position()
+
+    def get_position(self):
+        return self.x[0] + self.midpos_m
+
+    def get_velocity(self):
+        return self.x[1]
+
+
+def _matmul(a, b):
+    """Multiply two stacks of 2x2 matrices laid out as (2, 2, N)."""
+    return np.einsum("ijn,jkn->ikn", a, b)
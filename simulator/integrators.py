@@ -0,0 +1,293 @@
+"""
+Integrators for SpringMassDamperModel.
+
+Every integrator is registered by name with register_integrator and has the
+signature integrator(model, force, dt, **options) -> IntegrationStats. It
+advances model.x by dt while holding the (already saturated) force constant.
+
+"euler" and "zoh" freeze the effective spring constant at the start of the
+frame, exactly like the original model. "rk4", "rk45" and "trapezoidal"
+integrate the clamped spring force continuously and locate the instants at
+which the spring enters or leaves its clamp (k * |x| == max_spring_force_N),
+splitting the step there so the switch is not smeared over a whole step.
+"""
+
+import numpy as np
+
+INTEGRATORS = {}
+
+
+def register_integrator(name):
+    """Decorator that makes an integrator selectable by name."""
+
+    def decorator(func):
+        INTEGRATORS[name] = func
+        return func
+
+    return decorator
+
+
+def get_integrator(name):
+    if name not in INTEGRATORS:
+        raise ValueError(
+            f"Unknown integrator '{name}', expected one of {sorted(INTEGRATORS)}"
+        )
+    return INTEGRATORS[name]
+
+
+class IntegrationStats:
+    """What an integrator did during one call (one frame)."""
+
+    def __init__(self):
+        self.steps = 0  # accepted steps
+        self.rejected_steps = 0  # steps thrown away by error control
+        self.events = []  # list of (time since start of frame, event name)
+
+    def __repr__(self):
+        return (
+            f"IntegrationStats(steps={self.steps}, "
+            f"rejected_steps={self.rejected_steps}, events={self.events})"
+        )
+
+
+@register_integrator("euler")
+def integrate_euler(model, force, dt, num_steps=500):
+    stats = IntegrationStats()
+    for _ in range(num_steps):
+        x_dot = model.compute_derivative(force)
+        model.x = model.x + (x_dot * dt / num_steps)  # Euler's method
+    stats.steps = num_steps
+    return stats
+
+
+@register_integrator("zoh")
+def integrate_zoh(model, force, dt):
+    stats = IntegrationStats()
+    eff_spring_constant = model.compute_non_linear_spring_constant()
+    Ad, Bd = model.compute_discretized_matrices(eff_spring_constant, dt)
+    model.x = Ad @ model.x + Bd * force
+    stats.steps = 1
+    return stats
+
+
+@register_integrator("rk4")
+def integrate_rk4(model, force, dt, num_steps=10, event_tolerance=1e-9):
+    derivative = _make_derivative(model, force)
+
+    def step(state, h):
+        k1 = derivative(state)
+        k2 = derivative(_add(state, k1, h / 2))
+        k3 = derivative(_add(state, k2, h / 2))
+        k4 = derivative(_add(state, k3, h))
+        return (
+            state[0] + h / 6 * (k1[0] + 2 * k2[0] + 2 * k3[0] + k4[0]),
+            state[1] + h / 6 * (k1[1] + 2 * k2[1] + 2 * k3[1] + k4[1]),
+        )
+
+    return _integrate_fixed_step(model, step, dt, num_steps, event_tolerance)
+
+
+@register_integrator("trapezoidal")
+def integrate_trapezoidal(model, force, dt, num_steps=10, event_tolerance=1e-9):
+    """
+    Implicit trapezoidal rule. The dynamics are affine inside each spring
+    region, so the implicit equation is solved in closed form using the
+    region at the start of the step; the event locator splits any step that
+    crosses into the other region. A-stable, so stiff k/b settings are safe.
+    """
+    derivative = _make_derivative(model, force)
+    mass = model.mass
+    b_damper = model.b_damper
+
+    def step(state, h):
+        position, velocity = state
+        spring_gain, spring_offset = _spring_region(model, position)
+        acceleration = derivative(state)[1]
+        velocity_new = (
+            velocity
+            + h / 2 * acceleration
+            + h
+            / (2 * mass)
+            * (force - spring_offset - spring_gain * (position + h / 2 * velocity))
+        ) / (1 + h * b_damper / (2 * mass) + h**2 * spring_gain / (4 * mass))
+        position_new = position + h / 2 * (velocity + velocity_new)
+        return position_new, velocity_new
+
+    return _integrate_fixed_step(model, step, dt, num_steps, event_tolerance)
+
+
+# Dormand-Prince 5(4) coefficients
+_DP_C = (0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1, 1)
+_DP_A = (
+    (),
+    (1 / 5,),
+    (3 / 40, 9 / 40),
+    (44 / 45, -56 / 15, 32 / 9),
+    (19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729),
+    (9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656),
+    (35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84),
+)
+_DP_B5 = (35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84, 0)
+_DP_B4 = (
+    5179 / 57600,
+    0,
+    7571 / 16695,
+    393 / 640,
+    -92097 / 339200,
+    187 / 2100,
+    1 / 40,
+)
+
+
+@register_integrator("rk45")
+def integrate_rk45(
+    model,
+    force,
+    dt,
+    rtol=1e-6,
+    atol=1e-9,
+    initial_step=None,
+    min_step=1e-12,
+    event_tolerance=1e-9,
+):
+    """
+    Adaptive Dormand-Prince RK45. The step grows while the plant is calm and
+    shrinks when the local error estimate exceeds atol + rtol * |x|.
+    """
+    derivative = _make_derivative(model, force)
+    event = _make_spring_clamp_event(model)
+    stats = IntegrationStats()
+
+    def step_with_error(state, h):
+        stages = []
+        for i in range(7):
+            stage_state = state
+            for a, k in zip(_DP_A[i], stages):
+                stage_state = _add(stage_state, k, h * a)
+            stages.append(derivative(stage_state))
+        new_state = state
+        error = (0.0, 0.0)
+        for b5, b4, k in zip(_DP_B5, _DP_B4, stages):
+            new_state = _add(new_state, k, h * b5)
+            error = _add(error, k, h * (b5 - b4))
+        return new_state, error
+
+    def step(state, h):
+        return step_with_error(state, h)[0]
+
+    state = _get_state(model)
+    h = dt if initial_step is None else initial_step
+    t = 0.0
+    while dt - t > 1e-12 * dt:
+        h = min(h, dt - t)
+        new_state, error = step_with_error(state, h)
+        error_norm = max(
+            abs(error[i]) / (atol + rtol * max(abs(state[i]), abs(new_state[i])))
+            for i in range(2)
+        )
+
+        if error_norm > 1:
+            stats.rejected_steps += 1
+            h *= max(0.2, 0.9 * error_norm**-0.2)
+            if h < min_step:
+                raise RuntimeError(f"rk45 step size fell below {min_step} s")
+            continue
+
+        h_taken = h
+        if event is not None and (event(state) > 0) != (event(new_state) > 0):
+            h_taken = _locate_event(step, event, state, h, event_tolerance)
+            new_state = step(state, h_taken)
+            stats.events.append((t + h_taken, "spring_clamp"))
+
+        state = new_state
+        t += h_taken
+        stats.steps += 1
+        if h_taken == h:
+            h *= 5 if error_norm == 0 else min(5, 0.9 * error_norm**-0.2)
+
+    _set_state(model, state)
+    return stats
+
+
+def _integrate_fixed_step(model, step, dt, num_steps, event_tolerance):
+    event = _make_spring_clamp_event(model)
+    stats = IntegrationStats()
+    state = _get_state(model)
+    nominal_step = dt / num_steps
+    t = 0.0
+    while dt - t > 1e-12 * dt:
+        h = min(nominal_step, dt - t)
+        new_state = step(state, h)
+        if event is not None and (event(state) > 0) != (event(new_state) > 0):
+            h = _locate_event(step, event, state, h, event_tolerance)
+            new_state = step(state, h)
+            stats.events.append((t + h, "spring_clamp"))
+        state = new_state
+        t += h
+        stats.steps += 1
+
+    _set_state(model, state)
+    return stats
+
+
+def _locate_event(step, event, state, h, tolerance):
+    """
+    Bisect the step length for the instant the event function changes sign.
+    Returns a step length just past the crossing so the next step starts on
+    the far side of the switching surface.
+    """
+    start_sign = event(state) > 0
+    low, high = 0.0, h
+    while high - low > tolerance:
+        mid = (low + high) / 2
+        if (event(step(state, mid)) > 0) == start_sign:
+            low = mid
+        else:
+            high = mid
+    return high
+
+
+def _make_derivative(model, force):
+    """Continuous dynamics with the clamped spring force."""
+    mass = model.mass
+    k_spring = model.k_spring
+    b_damper = model.b_damper
+    max_spring_force_N = model.max_spring_force_N
+
+    def derivative(state):
+        position, velocity = state
+        spring_force = min(
+            max(k_spring * position, -max_spring_force_N), max_spring_force_N
+        )
+        return velocity, (force - spring_force - b_damper * velocity) / mass
+
+    return derivative
+
+
+def _make_spring_clamp_event(model):
+    """Event function that changes sign when the spring enters its clamp."""
+    if model.k_spring <= 0 or model.max_spring_force_N <= 0:
+        return None
+    return lambda state: model.k_spring * abs(state[0]) - model.max_spring_force_N
+
+
+def _spring_region(model, position):
+    """
+    Returns (gain, offset) such that the spring force is gain * x + offset in
+    the region containing position.
+    """
+    if model.k_spring * abs(position) <= model.max_spring_force_N:
+        return model.k_spring, 0.0
+    return 0.0, float(np.sign(position)) * model.max_spring_force_N
+
+
+def _add(state, derivative, h):
+    return state[0] + h * derivative[0], state[1] + h * derivative[1]
+
+
+def _get_state(model):
+    return float(model.x[0][0]), float(model.x[1][0])
+
+
+def _set_state(model, state):
+    model.x = np.array([[state[0]], [state[1]]])
@@ -0,0 +1,100 @@
+import numpy as np
+
+METRIC_NAMES = (
+    "iae",
+    "ise",
+    "overshoot_percent",
+    "rise_time",
+    "settling_time",
+    "peak_saturation",
+    "saturated_fraction",
+)
+
+
+def step_response_metrics(
+    time,
+    reference,
+    position,
+    force,
+    control_saturation,
+    initial_position,
+    settling_band=0.02,
+):
+    """
+    Computes tracking metrics for one or many closed-loop responses.
+
+    All signal arrays have time along the last axis and may carry any number
+    of leading batch axes (e.g. one row per gain candidate). The step is taken
+    to go from initial_position to the final reference value.
+    :param force: applied (already saturated) force
+    :param settling_band: settling tolerance as a fraction of the step size
+    :return: dict with one array per name in METRIC_NAMES:
+        iae / ise: integral of absolute / squared tracking error
+        overshoot_percent: peak travel past the final reference, in percent
+            of the step size
+        rise_time: time from 10% to 90% of the step (nan if never reached)
+        settling_time: time after which the position stays within the band
+            (nan if it has not settled by the end)
+        peak_saturation: largest |force| as a fraction of control_saturation
+        saturated_fraction: fraction of samples spent at control_saturation
+    """
+    time = np.asarray(time, dtype="float64")
+    reference = np.asarray(reference, dtype="float64")
+    position = np.asarray(position, dtype="float64")
+    force = np.asarray(force, dtype="float64")
+    reference, position, force = np.broadcast_arrays(reference, position, force)
+    control_saturation = np.asarray(control_saturation, dtype="float64")[..., None]
+    dt = np.diff(time, append=2 * time[-1] - time[-2])
+
+    error = reference - position
+    iae = np.sum(np.abs(error) * dt, axis=-1)
+    ise = np.sum(error**2 * dt, axis=-1)
+
+    final_reference = reference[..., -1:]
+    step_size = final_reference - np.asarray(initial_position)[..., None]
+    direction = np.where(step_size >= 0, 1.0, -1.0)
+    magnitude = np.abs(step_size)
+    safe_magnitude = np.where(magnitude > 0, magnitude, np.inf)
+
+    travel_past = np.max((position - final_reference) * direction, axis=-1)
+    overshoot = np.maximum(travel_past, 0) / safe_magnitude[..., 0] * 100
+
+    progress = (position - (final_reference - step_size)) / np.where(
+        step_size != 0, step_size, np.inf
+    )
+    rise_start = _first_time(time, progress >= 0.1)
+    rise_end = _first_time(time, progress >= 0.9)
+    rise_time = rise_end - rise_start
+
+    outside = np.abs(position - final_reference) > settling_band * magnitude
+    settling_time = _settling_time(time, outside)
+
+    usage = np.abs(force) / control_saturation
+    peak_saturation = np.max(usage, axis=-1)
+    saturated_fraction = np.mean(usage >= 1 - 1e-9, axis=-1)
+
+    return {
+        "iae": iae,
+        "ise": ise,
+        "overshoot_percent": overshoot,
+        "rise_time": rise_time,
+        "settling_time": settling_time,
+        "peak_saturation": peak_saturation,
+        "saturated_fraction": saturated_fraction,
+    }
+
+
+def _first_time(time, condition):
+    """Time of the first True along the last axis, or nan if there is none."""
+    first = np.argmax(condition, axis=-1)
+    return np.where(np.any(condition, axis=-1), time[first] - time[0], np.nan)
+
+
+def _settling_time(time, outside):
+    """Time after the last sample outside the band, or nan if it ends outside."""
+    last_outside = outside.shape[-1] - 1 - np.argmax(outside[..., ::-1], axis=-1)
+    settled_index = np.minimum(last_outside + 1, len(time) - 1)
+    settling_time = np.where(
+        np.any(outside, axis=-1), time[settled_index] - time[0], 0.0
+    )
+    return np.where(outside[..., -1], np.nan, settling_time)
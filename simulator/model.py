@@ -1,9 +1,32 @@
+from collections import OrderedDict
+
 import numpy as np
 
+from integrators import IntegrationStats, get_integrator
+
+# The plant used in the workshop, centred on an 8 m long track
+WORKSHOP_MODEL_PARAMS = {
+    "mass": 1.5,
+    "k_spring": 0.3,
+    "max_spring_force_N": 1,
+    "b_damper": 0.15,
+    "midpos_m": 4,
+    "control_saturation": 8,
+}
+
 
 class SpringMassDamperModel:
     def __init__(
-        self, mass, k_spring, max_spring_force_N, b_damper, midpos_m, control_saturation
+        self,
+        mass,
+        k_spring,
+        max_spring_force_N,
+        b_damper,
+        midpos_m,
+        control_saturation,
+        integrator="euler",
+        transition_cache_size=256,
+        integrator_options=None,
     ):
         self.mass = mass  # kg
         self.k_spring = k_spring  # N/m
@@ -21,6 +44,18 @@ class SpringMassDamperModel:
 
         self.x = np.array([[0], [0]])  # Position and velocity
 
+        # Any name registered in integrators.py, e.g. "euler" (fixed substeps),
+        # "zoh" (exact discretization of the frozen linear system), "rk4",
+        # "rk45" or "trapezoidal". integrator_options are passed through to it.
+        self.integrator = integrator
+        self.integrate = get_integrator(integrator)
+        self.integrator_options = dict(integrator_options or {})
+        self.transition_cache = TransitionMatrixCache(transition_cache_size)
+
+        # Steps taken and events found during the last compute_new_position
+        self.last_integration = IntegrationStats()
+        self.saturated = False
+
     def compute_non_linear_spring_constant(self):
         delta_pos = np.abs(self.get_position() - self.midpos_m)
         non_clamped_spring_force = self.k_spring * delta_pos
@@ -36,12 +71,50 @@ class SpringMassDamperModel:
         force = np.array([[force]], dtype="float64")
         return self.A @ self.x + self.B @ force
 
-    def compute_new_position(self, force, dt, num_steps=500):
+    def compute_discretized_matrices(self, eff_spring_constant, dt):
+        """
+        Returns (Ad, Bd), the exact zero-order-hold discretization of (A, B)
+        for the given effective spring constant and step length.
+
+        exp([[A, B], [0, 0]] * dt) = [[Ad, Bd], [0, I]], so both matrices come
+        from one matrix exponential. Results are memoized in a bounded LRU
+        cache keyed by (effective spring constant, dt).
+        """
+        key = (float(eff_spring_constant), float(dt))
+        matrices = self.transition_cache.get(key)
+        if matrices is None:
+            A = np.array(self.A, dtype="float64")
+            A[1][0] = -eff_spring_constant / self.mass
+            augmented = np.zeros((3, 3))
+            augmented[:2, :2] = A
+            augmented[:2, 2:] = self.B
+            transition = _expm(augmented * dt)
+            matrices = (transition[:2, :2].copy(), transition[:2, 2:].copy())
+            self.transition_cache.put(key, matrices)
+        return matrices
+
+    def compute_new_position(self, force, dt, num_steps=None):
+        """
+        Advance the model by dt with the force held constant.
+        :param num_steps: substeps for the fixed-step integrators, or None for
+            the integrator's own default (500 for "euler")
+        """
         eff_spring_constant = self.compute_non_linear_spring_constant()
         self.A[1][0] = -eff_spring_constant / self.mass
-        for _ in range(num_steps):
-            x_dot = self.compute_derivative(force)
-            self.x = self.x + (x_dot * dt / num_steps)  # Euler's method
+
+        saturated = abs(force) > self.control_saturation
+        force = float(np.clip(force, -self.control_saturation, self.control_saturation))
+
+        options = self.integrator_options
+        if num_steps is not None:
+            options = dict(options, num_steps=num_steps)
+        self.last_integration = self.integrate(self, force, dt, **options)
+
+        # The force is held for the whole frame, so the actuator can only
+        # enter or leave saturation at a frame boundary
+        if saturated != self.saturated:
+            self.last_integration.events.insert(0, (0.0, "control_saturation"))
+            self.saturated = saturated
 
         return self.get_position()
 
@@ -50,3 +123,48 @@ class SpringMassDamperModel:
 
     def get_velocity(self):
         return self.x[1][0]
+
+
+class TransitionMatrixCache:
+    """A bounded least-recently-used store of discretized (Ad, Bd) pairs."""
+
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        matrices = self.entries.get(key)
+        if matrices is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return matrices
+
+    def put(self, key, matrices):
+        self.entries[key] = matrices
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+def _expm(matrix, num_terms=20):
+    """Matrix exponential by scaling and squaring of a truncated Taylor series."""
+    norm = np.linalg.norm(matrix, ord=np.inf)
+    num_squarings = max(0, int(np.ceil(np.log2(norm))) + 1) if norm > 0 else 0
+    scaled = matrix / 2**num_squarings
+
+    result = np.eye(matrix.shape[0])
+    term = np.eye(matrix.shape[0])
+    for i in range(1, num_terms):
+        term = term @ scaled / i
+        result = result + term
+
+    for _ in range(num_squarings):
+        result = result @ result
+    return result
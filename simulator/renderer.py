@@ -1,6 +1,11 @@
+from collections import OrderedDict
+
+import numpy as np
 import pygame
 import sys
 
+from time_series import TimeSeriesBuffer, min_max_decimate
+
 
 # A minimal slider class for demonstration
 class Slider:
@@ -24,13 +29,21 @@ class Slider:
         )
 
     def draw(self, surface, font):
+        self.draw_track(surface)
+        self.draw_handle(surface, font)
+
+    def draw_track(self, surface):
         # Draw slider track (the bar)
         pygame.draw.rect(surface, (180, 180, 180), self.rect, border_radius=3)
+
+    def draw_handle(self, surface, font):
+        """Draws the parts that change with the value; returns their bounds."""
         # Draw handle
         pygame.draw.rect(surface, (120, 120, 120), self.handle_rect, border_radius=3)
         # Draw label and value
         text_surface = font.render(f"{self.label}: {self.value:.2f}", True, (0, 0, 0))
-        surface.blit(text_surface, (self.rect.x, self.rect.y - 20))
+        text_rect = surface.blit(text_surface, (self.rect.x, self.rect.y - 20))
+        return text_rect.union(self.handle_rect)
 
     def handle_event(self, event):
         # Only handle mouse events for simplicity
@@ -58,8 +71,48 @@ class Slider:
         return self.value
 
 
+class TextCache:
+    """
+    A bounded cache of rendered text surfaces, keyed by (text, antialias,
+    colour). It has the render() and get_linesize() methods of the wrapped
+    pygame font, so it can be used anywhere a font is expected; labels that
+    did not change since the last frame are blitted instead of re-rasterized.
+    """
+
+    def __init__(self, font, max_size=512):
+        self.font = font
+        self.max_size = max_size
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text, antialias, color):
+        key = (text, antialias, tuple(color))
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self.font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def get_linesize(self):
+        return self.font.get_linesize()
+
+
 class Renderer:
-    def __init__(self, length_m, width=800, height=400):
+    def __init__(
+        self, length_m, width=800, height=400, plot_capacity=4096, dirty_rects=False
+    ):
+        """
+        :param dirty_rects: only redraw and push to the display the regions
+            that changed each frame, instead of flipping the whole window
+        """
         pygame.init()
         self.screen = pygame.display.set_mode((width, height))
         pygame.display.set_caption("PID Controller Visualization")
@@ -69,8 +122,8 @@ class Renderer:
         self.height = height
         self.clock = pygame.time.Clock()
 
-        # Set up font
-        self.font = pygame.font.SysFont(None, 24)
+        # Set up font, caching rendered labels since most repeat every frame
+        self.font = TextCache(pygame.font.SysFont(None, 24))
 
         # Create sliders for kp, ki, kd
         max_gain = 3
@@ -91,7 +144,8 @@ class Renderer:
         # -----------------------------
         # PLOT-RELATED ATTRIBUTES
         # -----------------------------
-        self.plot_data = {}  # dictionary: label -> list of (time, value)
+        self.plot_data = {}  # dictionary: label -> TimeSeriesBuffer
+        self.plot_capacity = plot_capacity  # max samples kept per label
         self.plot_colors = {}  # label -> (r,g,b)
         self.time_window = 10.0  # seconds to show on the plot
         # Some distinct colors we’ll cycle through when a new label appears:
@@ -105,16 +159,51 @@ class Renderer:
             (100, 100, 100),
         ]
 
+        # -----------------------------
+        # CACHED STATIC LAYER
+        # -----------------------------
+        # Everything that does not change between frames (background, slider
+        # tracks, plot backgrounds, axes and titles) is drawn once into this
+        # surface and rebuilt only when the window size or the set of plotted
+        # labels changes.
+        self.dirty_rects = dirty_rects
+        self.background = None
+        self.background_key = None
+        self.slider_rects = {}  # slider -> (drawn value, bounds of last draw)
+
     def update(self):
         """Updates the display. Call this once per frame."""
         self.clock.tick(60)
-        self.screen.fill((255, 255, 255))
-
-        # Draw the sliders
-        self.slider_kp.draw(self.screen, self.font)
-        self.slider_ki.draw(self.screen, self.font)
-        self.slider_kd.draw(self.screen, self.font)
-        self.slider_ref.draw(self.screen, self.font)
+        full_redraw = self._update_background() or not self.dirty_rects
+        sliders = [self.slider_kp, self.slider_ki, self.slider_kd, self.slider_ref]
+
+        # Regions redrawn every frame: the track with the two circles, and the
+        # plot area. Everything else is only redrawn when it changes.
+        track_rect = pygame.Rect(0, self.height // 2 - 12, self.width, 25)
+        plot_region = self._plot_region()
+        changed = [track_rect, plot_region]
+        if full_redraw:
+            self.screen.blit(self.background, (0, 0))
+            self.slider_rects = {}
+        else:
+            self.screen.blit(self.background, track_rect, track_rect)
+            self.screen.blit(self.background, plot_region, plot_region)
+
+        # Draw the sliders that moved since they were last drawn (or that
+        # were just painted over by one of the regions above)
+        for slider in sliders:
+            last = self.slider_rects.get(slider)
+            if (
+                last is not None
+                and last[0] == slider.value
+                and last[1].collidelist(changed) == -1
+            ):
+                continue
+            if last is not None:
+                self.screen.blit(self.background, last[1], last[1])
+            bounds = slider.draw_handle(self.screen, self.font)
+            self.slider_rects[slider] = (slider.value, bounds)
+            changed.append(bounds if last is None else bounds.union(last[1]))
 
         # Draw the reference (cyan circle)
         ref_x_m = self.get_selected_reference()
@@ -133,10 +222,13 @@ class Renderer:
             12,
         )
 
-        # Draw the real-time plot in the top portion (example region)
+        # Draw the real-time plot in the bottom portion
         self._draw_plot()
 
-        pygame.display.flip()
+        if full_redraw:
+            pygame.display.flip()
+        else:
+            pygame.display.update(changed)
 
         # Event handling
         for event in pygame.event.get():
@@ -150,6 +242,23 @@ class Renderer:
             self.slider_kd.handle_event(event)
             self.slider_ref.handle_event(event)
 
+    def _update_background(self):
+        """
+        Rebuilds the cached static layer if the layout changed.
+        :return: True if it was rebuilt (the whole window must be redrawn)
+        """
+        key = (self.screen.get_size(), tuple(sorted(self.plot_data)))
+        if key == self.background_key:
+            return False
+
+        self.background = pygame.Surface(self.screen.get_size()).convert()
+        self.background.fill((255, 255, 255))
+        for slider in [self.slider_kp, self.slider_ki, self.slider_kd, self.slider_ref]:
+            slider.draw_track(self.background)
+        self._draw_plot_background(self.background)
+        self.background_key = key
+        return True
+
     def set_object_state(self, position, velocity=0.0):
         """Sets the object's current state in the 1D space."""
         self.object_pos_pixels = position * self.meters_to_pixels_gain
@@ -176,43 +285,136 @@ class Renderer:
         # Make sure we have an entry in self.plot_data for each label
         for i, label in enumerate(labels):
             if label not in self.plot_data:
-                self.plot_data[label] = []
+                self.plot_data[label] = TimeSeriesBuffer(self.plot_capacity)
                 # Assign a color from the bank
                 color_idx = len(self.plot_colors) % len(self.color_bank)
                 self.plot_colors[label] = self.color_bank[color_idx]
 
             # Append the (time, value) pair
-            self.plot_data[label].append((time_now, data[i]))
+            self.plot_data[label].append(time_now, data[i])
 
             # Remove old data outside the time window
-            min_time = time_now - self.time_window
-            # Keep only points where t >= min_time
-            self.plot_data[label] = [
-                (t, val) for (t, val) in self.plot_data[label] if t >= min_time
-            ]
+            self.plot_data[label].evict_before(time_now - self.time_window)
 
-    def _draw_plot(self):
-        """Draws each signal in its own subplot at the bottom of the screen."""
-        # How tall we want all plots combined to be
-        plot_height = 400
-        # Rectangle for the combined plot area at the bottom
-        plot_rect = pygame.Rect(0, self.height - plot_height, self.width, plot_height)
+    # How tall we want all plots combined to be
+    plot_height = 400
+    # We'll define a small margin inside each subplot
+    margin_left = 45
+    margin_right = 10
+    margin_top = 10
+    margin_bottom = 20  # Also room for X-axis on bottom subplot
+
+    def _plot_layout(self):
+        """
+        Returns the rectangle of the combined plot area at the bottom and one
+        subplot rectangle per label, in drawing order.
+        """
+        plot_rect = pygame.Rect(
+            0, self.height - self.plot_height, self.width, self.plot_height
+        )
+
+        # One subplot per label. Sort or just iterate in insertion order. For
+        # readability, we'll use sorted(self.plot_data.keys()).
+        labels = sorted(self.plot_data.keys())
+        # Height of each individual subplot
+        subplot_height = self.plot_height / max(len(labels), 1)
+        sub_rects = [
+            pygame.Rect(
+                plot_rect.x,
+                plot_rect.y + index * subplot_height,
+                plot_rect.width,
+                subplot_height,
+            )
+            for index in range(len(labels))
+        ]
+        return plot_rect, labels, sub_rects
+
+    def _plot_region(self):
+        """The plot area plus the info text row just above it."""
+        plot_rect, _, _ = self._plot_layout()
+        text_height = self.font.get_linesize() + 2
+        return pygame.Rect(
+            plot_rect.x,
+            plot_rect.y - text_height,
+            plot_rect.width,
+            plot_rect.height + text_height,
+        )
+
+    def _draw_plot_background(self, surface):
+        """Draws the parts of the plots that only change with the layout."""
+        plot_rect, labels, sub_rects = self._plot_layout()
 
         # Fill with a light background
-        pygame.draw.rect(self.screen, (230, 230, 230), plot_rect)
+        pygame.draw.rect(surface, (230, 230, 230), plot_rect)
+
+        font_height = self.font.get_linesize()
+        axis_color = (50, 50, 50)
+        for index, (label, sub_rect) in enumerate(zip(labels, sub_rects)):
+            # Fill background just for clarity (optional)
+            pygame.draw.rect(surface, (240, 240, 240), sub_rect)
+
+            # The “content” area inside the subplot
+            content_width = sub_rect.width - self.margin_left - self.margin_right
+            content_height = sub_rect.height - self.margin_top - self.margin_bottom
+            y_axis_bottom = sub_rect.y + self.margin_top + content_height
+
+            # Vertical axis
+            pygame.draw.line(
+                surface,
+                axis_color,
+                (sub_rect.x + self.margin_left, sub_rect.y + self.margin_top),
+                (sub_rect.x + self.margin_left, y_axis_bottom),
+                2,
+            )
+            # Horizontal axis (along the bottom of this subplot)
+            pygame.draw.line(
+                surface,
+                axis_color,
+                (sub_rect.x + self.margin_left, y_axis_bottom),
+                (sub_rect.x + self.margin_left + content_width, y_axis_bottom),
+                2,
+            )
+
+            # Label the bottom axis of the last subplot as “Time [s]”
+            if index == len(labels) - 1:
+                time_label_surf = self.font.render("Time [s]", True, (0, 0, 0))
+                surface.blit(
+                    time_label_surf,
+                    (
+                        sub_rect.x
+                        + self.margin_left
+                        + content_width
+                        - time_label_surf.get_width(),
+                        y_axis_bottom + 6 + font_height,
+                    ),
+                )
 
+            # Draw the signal label in the top-left corner
+            label_surface = self.font.render(label, True, (0, 0, 0))
+            surface.blit(
+                label_surface, (sub_rect.x + self.width * 1 / 6, sub_rect.y + 5)
+            )
+
+    def _draw_plot(self):
+        """
+        Draws each signal in its own subplot at the bottom of the screen. Only
+        the data-dependent parts are drawn here; backgrounds, axes and titles
+        come from the cached layer built by _draw_plot_background.
+        """
         # If there is no data, just return
         if not self.plot_data:
             return
 
+        plot_rect, labels, sub_rects = self._plot_layout()
+
         # ------------------------------------------------------------
         # 1. Find the total time range (shared across all subplots)
         # ------------------------------------------------------------
         # Determine the latest time from all series:
         max_time = 0.0
         for label, series in self.plot_data.items():
-            if series:
-                last_t = series[-1][0]
+            if len(series):
+                last_t = series.times[-1]
                 max_time = max(max_time, last_t)
 
         # The minimum time in the window
@@ -227,17 +429,9 @@ class Renderer:
         # ------------------------------------------------------------
         # 2. Prepare for subplots
         # ------------------------------------------------------------
-        # One subplot per label
-        num_signals = len(self.plot_data)
-
-        # Height of each individual subplot
-        subplot_height = plot_height / max(num_signals, 1)
-
-        # We'll define a small margin inside each subplot
-        margin_left = 45
-        margin_right = 10
-        margin_top = 10
-        margin_bottom = 20  # Also room for X-axis on bottom subplot
+        num_signals = len(labels)
+        margin_left = self.margin_left
+        margin_top = self.margin_top
 
         # We'll define the number of Y-ticks and (optionally) X-ticks
         num_y_ticks = 3
@@ -245,37 +439,26 @@ class Renderer:
 
         # Pre-compute the font height for labels
         font_height = self.font.get_linesize()
+        axis_color = (50, 50, 50)
 
         # A helper function to draw a single subplot
-        def draw_subplot(index, label, series, color):
+        def draw_subplot(index, sub_rect, series, color):
             """
             index: which subplot (0-based)
-            label: the name of the signal
-            series: list of (t, val) for this signal
+            sub_rect: the subplot rectangle
+            series: TimeSeriesBuffer for this signal
             color: (R,G,B) for the line
             """
-            # Subplot rectangle:
-            sub_rect_y = plot_rect.y + index * subplot_height
-            sub_rect = pygame.Rect(
-                plot_rect.x, sub_rect_y, plot_rect.width, subplot_height
-            )
-
-            # Fill background just for clarity (optional)
-            pygame.draw.rect(self.screen, (240, 240, 240), sub_rect)
-
-            # If there's not enough data, just label it and return
+            # If there's no data, the cached layer already shows the label
             if len(series) < 1:
-                # Draw label text (signal name) near top-left
-                label_surface = self.font.render(label, True, (0, 0, 0))
-                self.screen.blit(label_surface, (sub_rect.x + 5, sub_rect.y + 5))
                 return
 
             # --------------------------------------------------------
             # 2A. Determine min/max of this signal for Y auto-scaling
             # --------------------------------------------------------
-            values = [val for (t, val) in series]
-            min_val = min(values)
-            max_val = max(values)
+            values = series.values
+            min_val = float(values.min())
+            max_val = float(values.max())
 
             if abs(max_val - min_val) < 1e-6:
                 max_val += 1e-6
@@ -286,8 +469,8 @@ class Renderer:
             max_val += padding
 
             # The “content” area inside the subplot
-            content_width = sub_rect.width - margin_left - margin_right
-            content_height = sub_rect.height - margin_top - margin_bottom
+            content_width = sub_rect.width - margin_left - self.margin_right
+            content_height = sub_rect.height - margin_top - self.margin_bottom
 
             # Y-axis scaling
             y_range = max_val - min_val
@@ -295,53 +478,26 @@ class Renderer:
             if y_range < 1e-6:
                 y_range = 1e-6
 
-            # A helper to scale (time, value) -> (x, y) in the subplot
-            def to_screen_coords(t, v):
-                # X: linear from [min_time, max_time] -> [left_margin, left_margin + content_width]
-                x = (
-                    sub_rect.x
-                    + margin_left
-                    + (t - min_time) * (content_width / time_range)
-                )
-                # Y: invert so higher values appear “higher” in the plot
-                y = (sub_rect.y + margin_top + content_height) - (v - min_val) * (
-                    content_height / y_range
-                )
-                return x, y
-
             # --------------------------------------------------------
-            # 2B. Draw axes lines
+            # 2B. Draw the data line
             # --------------------------------------------------------
-            axis_color = (50, 50, 50)
-            # Vertical axis
-            pygame.draw.line(
-                self.screen,
-                axis_color,
-                (sub_rect.x + margin_left, sub_rect.y + margin_top),
-                (sub_rect.x + margin_left, sub_rect.y + margin_top + content_height),
-                2,
+            # Keep at most a min/max pair per pixel column so the cost does
+            # not grow with the sample rate or the time window
+            x_px, plot_values = min_max_decimate(
+                series.times, values, min_time, time_range, content_width
             )
-            # Horizontal axis (along the bottom of this subplot)
-            pygame.draw.line(
-                self.screen,
-                axis_color,
-                (sub_rect.x + margin_left, sub_rect.y + margin_top + content_height),
-                (
-                    sub_rect.x + margin_left + content_width,
-                    sub_rect.y + margin_top + content_height,
-                ),
-                2,
-            )
-
-            # --------------------------------------------------------
-            # 2C. Draw the data line
-            # --------------------------------------------------------
-            points = [to_screen_coords(t, v) for (t, v) in series]
-            for i in range(len(points) - 1):
-                pygame.draw.line(self.screen, color, points[i], points[i + 1], 2)
+            # X: linear from [min_time, max_time] -> [left_margin, left_margin + content_width]
+            # Y: invert so higher values appear “higher” in the plot
+            points = np.empty((len(x_px), 2))
+            points[:, 0] = sub_rect.x + margin_left + x_px
+            points[:, 1] = (sub_rect.y + margin_top + content_height) - (
+                plot_values - min_val
+            ) * (content_height / y_range)
+            if len(points) > 1:
+                pygame.draw.lines(self.screen, color, False, points.tolist(), 2)
 
             # --------------------------------------------------------
-            # 2D. Y-axis ticks/labels
+            # 2C. Y-axis ticks/labels
             # --------------------------------------------------------
             # We'll place num_y_ticks ticks linearly between min_val and max_val
             for i_tick in range(num_y_ticks):
@@ -371,7 +527,7 @@ class Renderer:
                 )
 
             # --------------------------------------------------------
-            # 2E. X-axis ticks/labels (only on the bottom subplot)
+            # 2D. X-axis ticks/labels (only on the bottom subplot)
             # --------------------------------------------------------
             # If this is the last subplot (index == num_signals - 1), add time ticks
             if index == num_signals - 1:
@@ -402,37 +558,13 @@ class Renderer:
                         (x_tick - label_surface.get_width() / 2, y_axis_bottom + 6),
                     )
 
-                # Optionally, label the bottom axis as “Time [s]”
-                time_label = "Time [s]"
-                time_label_surf = self.font.render(time_label, True, (0, 0, 0))
-                self.screen.blit(
-                    time_label_surf,
-                    (
-                        sub_rect.x
-                        + margin_left
-                        + content_width
-                        - time_label_surf.get_width(),
-                        y_axis_bottom + 6 + font_height,
-                    ),
-                )
-
-            # --------------------------------------------------------
-            # 2F. Draw the signal label in the top-left corner
-            # --------------------------------------------------------
-            label_surface = self.font.render(label, True, (0, 0, 0))
-            self.screen.blit(
-                label_surface, (sub_rect.x + self.width * 1 / 6, sub_rect.y + 5)
-            )
-
         # ------------------------------------------------------------
         # 3. Loop over each signal and draw its subplot
         # ------------------------------------------------------------
-        # Sort or just iterate in insertion order. For readability,
-        # we'll use sorted(self.plot_data.keys()), but you can omit sorting if you prefer.
-        for i, label in enumerate(sorted(self.plot_data.keys())):
+        for i, (label, sub_rect) in enumerate(zip(labels, sub_rects)):
             series = self.plot_data[label]
             color = self.plot_colors.get(label, (0, 0, 0))
-            draw_subplot(i, label, series, color)
+            draw_subplot(i, sub_rect, series, color)
 
         # ------------------------------------------------------------
         # 4. Draw an additional info text (optional)
@@ -17,6 +17,10 @@ import numpy as np
 
 class Simulator:
     def __init__(self, controller, model, renderer, length_m, white_noise_percent):
+        """
+        :param renderer: a Renderer for interactive runs, or None for
+            headless runs via run_headless
+        """
         self.controller = controller
         self.model = model
         self.renderer = renderer
@@ -25,38 +29,36 @@ class Simulator:
         self.length_m = length_m
         self.white_noise_percent = white_noise_percent
 
+    def step(self, ref, gains):
+        """
+        Runs the controller and the model for one frame.
+        :return: (measured position, new position, force clipped to saturation)
+        """
+        kp, ki, kd = gains
+
+        actual_pos = self.model.get_position()
+        noise = random.uniform(-1, 1) * self.white_noise_percent / 100 * self.length_m
+        actual_pos += noise
+        force = self.controller.get_control_output(ref, actual_pos, self.dt, kp, ki, kd)
+        new_pos = self.model.compute_new_position(force, self.dt)
+
+        clipped_force = np.clip(
+            force, -self.model.control_saturation, self.model.control_saturation
+        )
+        return actual_pos, new_pos, clipped_force
+
     def run(self):
         try:
             time_now = 0
             while True:
                 ref = self.renderer.get_selected_reference()
                 gains = self.renderer.get_selected_gains()
-                kp, ki, kd = gains
-
-                actual_pos = self.model.get_position()
-                noise = (
-                    random.uniform(-1, 1)
-                    * self.white_noise_percent
-                    / 100
-                    * self.length_m
-                )
-                actual_pos += noise
-                force = self.controller.get_control_output(
-                    ref, actual_pos, self.dt, kp, ki, kd
-                )
-                new_pos = model.compute_new_position(force, self.dt)
-                self.renderer.set_object_state(new_pos, model.get_velocity)
+
+                actual_pos, new_pos, force = self.step(ref, gains)
+                self.renderer.set_object_state(new_pos, self.model.get_velocity())
 
                 labels = ["Reference", "Position", "Force"]
-                values = [
-                    ref,
-                    actual_pos,
-                    np.clip(
-                        force,
-                        -self.model.control_saturation,
-                        self.model.control_saturation,
-                    ),
-                ]
+                values = [ref, actual_pos, force]
                 self.renderer.plot(labels, values, time_now)
                 self.renderer.update()
                 time.sleep(self.dt)
@@ -65,6 +67,80 @@ class Simulator:
         except KeyboardInterrupt:
             click.secho("Exiting...", fg="red")
 
+    def run_headless(self, duration_s, reference, gains):
+        """
+        Runs the simulation for a fixed duration as fast as possible, without
+        the renderer, sleeping or any user input.
+        :param duration_s: simulated time in seconds
+        :param reference: reference position, or a function of time returning
+            it (see step_schedule)
+        :param gains: (kp, ki, kd), or a function of time returning them
+        :return: dict of NumPy arrays, one sample per frame: "time",
+            "reference", "measured_position", "position", "velocity", "force",
+            "kp", "ki" and "kd"
+        """
+        reference = _as_schedule(reference)
+        gains = _as_schedule(gains)
+
+        num_steps = int(round(duration_s / self.dt))
+        trajectory = {label: np.empty(num_steps) for label in TRAJECTORY_LABELS}
+
+        for i in range(num_steps):
+            time_now = i * self.dt
+            ref = reference(time_now)
+            kp, ki, kd = gains(time_now)
+
+            actual_pos, new_pos, force = self.step(ref, (kp, ki, kd))
+
+            trajectory["time"][i] = time_now
+            trajectory["reference"][i] = ref
+            trajectory["measured_position"][i] = actual_pos
+            trajectory["position"][i] = new_pos
+            trajectory["velocity"][i] = self.model.get_velocity()
+            trajectory["force"][i] = force
+            trajectory["kp"][i] = kp
+            trajectory["ki"][i] = ki
+            trajectory["kd"][i] = kd
+
+        return trajectory
+
+
+TRAJECTORY_LABELS = (
+    "time",
+    "reference",
+    "measured_position",
+    "position",
+    "velocity",
+    "force",
+    "kp",
+    "ki",
+    "kd",
+)
+
+
+def step_schedule(points):
+    """
+    Builds a piecewise-constant schedule from (start time, value) pairs.
+    Each value is held from its start time until the next one begins; before
+    the first start time the first value is used.
+    Ex: step_schedule([(0, 4.0), (5, 6.0)]) steps the reference at t = 5 s.
+    """
+    points = sorted(points, key=lambda point: point[0])
+    start_times = np.array([point[0] for point in points])
+    values = [point[1] for point in points]
+
+    def schedule(time_now):
+        index = max(np.searchsorted(start_times, time_now, side="right") - 1, 0)
+        return values[index]
+
+    return schedule
+
+
+def _as_schedule(value):
+    if callable(value):
+        return value
+    return lambda time_now: value
+
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Simulate a PID controller")
@@ -76,6 +152,38 @@ if __name__ == "__main__":
         action="store_true",
         help="Disable white noise in the simulation",
     )
+    parser.add_argument(
+        "--headless",
+        type=float,
+        metavar="SECONDS",
+        help="Simulate this many seconds without a window, as fast as possible",
+    )
+    parser.add_argument(
+        "--reference",
+        type=float,
+        help="Reference position for headless runs (default: mid position)",
+    )
+    parser.add_argument(
+        "--gains",
+        type=float,
+        nargs=3,
+        default=[1.0, 0.0, 0.0],
+        metavar=("KP", "KI", "KD"),
+        help="Controller gains for headless runs",
+    )
+    parser.add_argument(
+        "--integrator",
+        help="Model integrator (default: zoh for headless runs, euler otherwise)",
+    )
+    parser.add_argument(
+        "--dirty-rects",
+        action="store_true",
+        help="Only redraw the parts of the window that changed each frame",
+    )
+    parser.add_argument(
+        "--output",
+        help="Save the headless trajectory to this .npz file",
+    )
     args = parser.parse_args()
 
     noise_pct = 0.5
@@ -87,6 +195,10 @@ if __name__ == "__main__":
     else:
         from controller_implemented import Controller
 
+    integrator = args.integrator
+    if integrator is None:
+        integrator = "zoh" if args.headless is not None else "euler"
+
     controller = Controller()
     simulation_length_m = 8
     model = SpringMassDamperModel(
@@ -96,8 +208,33 @@ if __name__ == "__main__":
         b_damper=0.15,
         midpos_m=simulation_length_m / 2,
         control_saturation=8,
+        integrator=integrator,
+    )
+    if args.headless is not None:
+        simulator = Simulator(
+            controller, model, None, simulation_length_m, white_noise_percent=noise_pct
+        )
+        reference = args.reference
+        if reference is None:
+            reference = simulation_length_m / 2
+        start = time.perf_counter()
+        trajectory = simulator.run_headless(args.headless, reference, args.gains)
+        elapsed = time.perf_counter() - start
+        click.secho(
+            f"Simulated {args.headless:.1f}s in {elapsed * 1000:.1f}ms, "
+            f"final position {trajectory['position'][-1]:.3f}m",
+            fg="green",
+        )
+        if args.output:
+            np.savez(args.output, **trajectory)
+        sys.exit(0)
+
+    renderer = Renderer(
+        length_m=simulation_length_m,
+        width=1600,
+        height=1200,
+        dirty_rects=args.dirty_rects,
     )
-    renderer = Renderer(length_m=simulation_length_m, width=1600, height=1200)
     simulator = Simulator(
         controller, model, renderer, simulation_length_m, white_noise_percent=noise_pct
     )
@@ -0,0 +1,170 @@
+"""
+PID gain sweep: simulates many (kp, ki, kd) candidates against the same
+reference profile on a process pool and tabulates performance metrics.
+
+Ex: python3 simulator/sweep.py --kp 0 3 50 --ki 0 3 50 --kd 0 3 50 --reference 6
+"""
+
+import argparse
+import multiprocessing
+import os
+
+import numpy as np
+
+from controller_solution import BatchController
+from ensemble import SpringMassDamperEnsemble
+from metrics import METRIC_NAMES, step_response_metrics
+from model import WORKSHOP_MODEL_PARAMS
+
+TABLE_COLUMNS = ("kp", "ki", "kd") + METRIC_NAMES
+MAX_CHUNK_SIZE = 1024
+
+
+def gain_grid(kp_values, ki_values, kd_values):
+    """Returns every (kp, ki, kd) combination as an (N, 3) array."""
+    kp, ki, kd = np.meshgrid(kp_values, ki_values, kd_values, indexing="ij")
+    return np.column_stack([kp.ravel(), ki.ravel(), kd.ravel()])
+
+
+def sweep_gains(
+    candidates,
+    reference,
+    duration_s,
+    model_params=None,
+    dt=1 / 60,
+    processes=None,
+    chunk_size=None,
+):
+    """
+    Runs every gain candidate in closed loop and measures its step response.
+    :param candidates: sequence of (kp, ki, kd), e.g. from gain_grid
+    :param reference: reference position, a function of time, or an array
+        with one value per step
+    :param duration_s: simulated time per candidate
+    :param model_params: SpringMassDamperModel keyword arguments (default:
+        the workshop plant)
+    :param processes: worker processes (default: one per core)
+    :return: dict of arrays keyed by TABLE_COLUMNS, one row per candidate
+    """
+    candidates = np.asarray(candidates, dtype="float64").reshape(-1, 3)
+    if model_params is None:
+        model_params = WORKSHOP_MODEL_PARAMS
+    num_steps = int(round(duration_s / dt))
+    time = np.arange(num_steps) * dt
+    reference_profile = _sample_reference(reference, time)
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if chunk_size is None:
+        # A few chunks per worker keeps the pool balanced, and the cap bounds
+        # the memory each worker needs for its trajectories
+        chunk_size = int(np.ceil(len(candidates) / (processes * 4)))
+        chunk_size = min(max(chunk_size, 1), MAX_CHUNK_SIZE)
+    tasks = [
+        (candidates[start : start + chunk_size], reference_profile, dt, model_params)
+        for start in range(0, len(candidates), chunk_size)
+    ]
+
+    if processes == 1 or len(tasks) <= 1:
+        chunks = [_evaluate_candidates(task) for task in tasks]
+    else:
+        with multiprocessing.Pool(processes) as pool:
+            chunks = pool.map(_evaluate_candidates, tasks)
+
+    table = {"kp": candidates[:, 0], "ki": candidates[:, 1], "kd": candidates[:, 2]}
+    for name in METRIC_NAMES:
+        table[name] = np.concatenate([chunk[name] for chunk in chunks])
+    return table
+
+
+def _sample_reference(reference, time):
+    if callable(reference):
+        return np.array([reference(t) for t in time], dtype="float64")
+    reference = np.asarray(reference, dtype="float64")
+    if reference.ndim == 0:
+        return np.full(len(time), float(reference))
+    if len(reference) != len(time):
+        raise ValueError(
+            f"Reference profile has {len(reference)} samples, expected {len(time)}"
+        )
+    return reference
+
+
+def _evaluate_candidates(task):
+    """
+    Pool worker: simulates one chunk of candidates as a single ensemble, with
+    one loop of the batched controller per plant.
+    """
+    candidates, reference_profile, dt, model_params = task
+    num_candidates = len(candidates)
+    num_steps = len(reference_profile)
+    position = np.empty((num_candidates, num_steps))
+    force = np.empty((num_candidates, num_steps))
+
+    ensemble = SpringMassDamperEnsemble(**model_params, n=num_candidates)
+    controller = BatchController(num_candidates)
+    kp, ki, kd = candidates.T
+    for step, ref in enumerate(reference_profile):
+        u = controller.get_control_output(ref, ensemble.get_position(), dt, kp, ki, kd)
+        position[:, step] = ensemble.compute_new_position(u, dt)
+        force[:, step] = u
+
+    control_saturation = model_params["control_saturation"]
+    return step_response_metrics(
+        np.arange(num_steps) * dt,
+        reference_profile,
+        position,
+        np.clip(force, -control_saturation, control_saturation),
+        control_saturation,
+        model_params["midpos_m"],
+    )
+
+
+def save_table(table, path):
+    """Writes a sweep table as CSV with one row per candidate."""
+    columns = np.column_stack([table[name] for name in TABLE_COLUMNS])
+    np.savetxt(path, columns, delimiter=",", header=",".join(TABLE_COLUMNS))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep PID gains in parallel")
+    for gain in ("kp", "ki", "kd"):
+        parser.add_argument(
+            f"--{gain}",
+            type=float,
+            nargs=3,
+            default=[0.0, 3.0, 10],
+            metavar=("MIN", "MAX", "COUNT"),
+            help=f"Grid of {gain} values",
+        )
+    parser.add_argument(
+        "--reference", type=float, default=6.0, help="Step reference position"
+    )
+    parser.add_argument(
+        "--duration", type=float, default=20.0, help="Seconds per candidate"
+    )
+    parser.add_argument("--processes", type=int, help="Worker processes")
+    parser.add_argument("--output", help="Write the full table to this CSV file")
+    parser.add_argument(
+        "--top", type=int, default=10, help="Print this many best candidates"
+    )
+    args = parser.parse_args()
+
+    grids = [
+        np.linspace(lo, hi, int(count)) for lo, hi, count in (args.kp, args.ki, args.kd)
+    ]
+    candidates = gain_grid(*grids)
+    table = sweep_gains(
+        candidates, args.reference, args.duration, processes=args.processes
+    )
+
+    if args.output:
+        save_table(table, args.output)
+
+    print(",".join(TABLE_COLUMNS))
+    for row in np.argsort(table["iae"])[: args.top]:
+        print(",".join(f"{table[name][row]:.4g}" for name in TABLE_COLUMNS))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import os
+import sys
+import numpy as np
+import pytest
+
+# Get the absolute path of the project root
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, project_root)
+
+from simulator.controller_solution import BatchController, Controller
+
+
+def test_batch_controller_matches_scalar_controller():
+    rng = np.random.default_rng(0)
+    num_loops = 5
+    gains = rng.uniform(0, 3, size=(3, num_loops))
+    scalar_controllers = [Controller() for _ in range(num_loops)]
+    batch_controller = BatchController(num_loops)
+
+    dt = 1 / 60
+    for _ in range(200):
+        setpoints = rng.uniform(0, 8, num_loops)
+        positions = rng.uniform(0, 8, num_loops)
+
+        outputs = batch_controller.get_control_output(setpoints, positions, dt, *gains)
+
+        for i, controller in enumerate(scalar_controllers):
+            expected = controller.get_control_output(
+                setpoints[i], positions[i], dt, *gains[:, i]
+            )
+            assert outputs[i] == pytest.approx(expected, rel=1e-12)
+
+
+def test_batch_controller_broadcasts_scalars():
+    batch_controller = BatchController(3)
+
+    outputs = batch_controller.get_control_output(
+        1.0, np.array([0.0, 1.0, 2.0]), 0.5, 2.0, 1.0, 0.0
+    )
+
+    # P: 2 * error, I: 1 * error * dt
+    assert outputs == pytest.approx([2.5, 0.0, -2.5])
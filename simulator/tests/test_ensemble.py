@@ -0,0 +1,51 @@
+import os
+import sys
+import numpy as np
+import pytest
+
+# Get the absolute path of the project root
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, project_root)
+# Modules inside simulator/ import each other by their flat names
+sys.path.append(os.path.join(project_root, "simulator"))
+
+from simulator.model import SpringMassDamperModel
+from simulator.ensemble import SpringMassDamperEnsemble
+
+
+def test_ensemble_matches_individual_models():
+    # (mass, k_spring, max_spring_force_N, b_damper, midpos_m, control_saturation)
+    params = [
+        (1.5, 0.3, 1, 0.15, 4, 8),
+        (1.0, 3, 0.5, 0.5, 2, 2),
+        (2, 0, 0, 0, 0, 10),
+    ]
+    models = [SpringMassDamperModel(*p) for p in params]
+    ensemble = SpringMassDamperEnsemble(*[np.array(column) for column in zip(*params)])
+
+    dt = 1 / 60
+    for frame in range(100):
+        forces = np.array([5 * np.sin(frame / 10), 3.0, -1.0])
+        positions = ensemble.compute_new_position(forces, dt)
+        expected = [m.compute_new_position(forces[i], dt) for i, m in enumerate(models)]
+        assert positions == pytest.approx(expected, abs=1e-9)
+
+    velocities = [m.get_velocity() for m in models]
+    assert ensemble.get_velocity() == pytest.approx(velocities, abs=1e-9)
+
+
+def test_ensemble_broadcasts_scalar_parameters():
+    ensemble = SpringMassDamperEnsemble(1, 0, 0, 0, 0, 100, n=4)
+    test_force_N = 2
+    dt = 0.5
+
+    positions = ensemble.compute_new_position(test_force_N, dt)
+
+    # x_dot_dot = F/m, therefore x = F/m * t^2/2
+    assert positions.shape == (4,)
+    assert positions == pytest.approx(np.full(4, test_force_N * dt**2 / 2), abs=0.005)
+
+
+def test_ensemble_rejects_mismatched_size():
+    with pytest.raises(ValueError):
+        SpringMassDamperEnsemble([1, 2, 3], 0, 0, 0, 0, 1, n=4)
@@ -0,0 +1,110 @@
+import os
+import sys
+import numpy as np
+import pytest
+
+# Get the absolute path of the project root
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, project_root)
+# Modules inside simulator/ import each other by their flat names
+sys.path.append(os.path.join(project_root, "simulator"))
+
+from model import SpringMassDamperModel
+from integrators import INTEGRATORS, IntegrationStats, register_integrator
+
+
+@pytest.mark.parametrize("integrator", ["rk4", "rk45", "trapezoidal", "zoh"])
+def test_integrator_free_mass(integrator):
+    test_mass_kg = 1
+    test_force_N = 2
+    model = SpringMassDamperModel(test_mass_kg, 0, 0, 0, 0, 100, integrator=integrator)
+
+    dt = 0.5
+
+    # x_dot_dot = F/m, therefore x = F/m * t^2/2
+    expected_position = test_force_N / test_mass_kg * dt**2 / 2
+    assert pytest.approx(model.compute_new_position(test_force_N, dt)) == (
+        expected_position
+    )
+    assert model.last_integration.steps >= 1
+
+
+@pytest.mark.parametrize("integrator", ["rk4", "trapezoidal"])
+def test_integrators_agree_with_tight_rk45(integrator):
+    reference = SpringMassDamperModel(
+        1.5,
+        0.3,
+        1,
+        0.15,
+        4,
+        8,
+        integrator="rk45",
+        integrator_options={"rtol": 1e-11, "atol": 1e-13},
+    )
+    model = SpringMassDamperModel(1.5, 0.3, 1, 0.15, 4, 8, integrator=integrator)
+
+    dt = 1 / 60
+    for frame in range(300):
+        force = 9 * np.sin(frame / 30)
+        expected_position = reference.compute_new_position(force, dt)
+        assert pytest.approx(model.compute_new_position(force, dt), abs=1e-5) == (
+            expected_position
+        )
+
+
+def test_spring_clamp_event_is_located():
+    k_spring = 2
+    max_spring_force_N = 1
+    model = SpringMassDamperModel(
+        1, k_spring, max_spring_force_N, 0, 0, 100, integrator="rk4"
+    )
+
+    dt = 1 / 60
+    for _ in range(120):
+        model.compute_new_position(3, dt)
+        events = [e for e in model.last_integration.events if e[1] == "spring_clamp"]
+        if events:
+            break
+
+    assert len(events) == 1
+    # The clamp engages at |x| = max_spring_force_N / k_spring
+    assert pytest.approx(abs(model.get_position()), abs=0.05) == (
+        max_spring_force_N / k_spring
+    )
+
+
+def test_control_saturation_event():
+    model = SpringMassDamperModel(1, 0, 0, 0, 0, 5, integrator="rk4")
+
+    model.compute_new_position(1, 0.1)
+    assert model.last_integration.events == []
+    model.compute_new_position(10, 0.1)
+    assert model.last_integration.events == [(0.0, "control_saturation")]
+    model.compute_new_position(10, 0.1)
+    assert model.last_integration.events == []
+
+
+def test_rk45_takes_few_steps_when_calm():
+    model = SpringMassDamperModel(1.5, 0.3, 1, 0.15, 4, 8, integrator="rk45")
+
+    model.compute_new_position(0, 1 / 60)
+
+    assert model.last_integration.steps == 1
+    assert model.last_integration.rejected_steps == 0
+
+
+def test_registered_integrator_is_selectable():
+    @register_integrator("test_hold")
+    def integrate_hold(model, force, dt):
+        return IntegrationStats()
+
+    try:
+        model = SpringMassDamperModel(1, 0, 0, 0, 0, 5, integrator="test_hold")
+        assert model.compute_new_position(5, 1.0) == 0
+    finally:
+        del INTEGRATORS["test_hold"]
+
+
+def test_unknown_integrator():
+    with pytest.raises(ValueError):
+        SpringMassDamperModel(1, 0, 0, 0, 0, 5, integrator="leapfrog")
@@ -0,0 +1,48 @@
+import os
+import sys
+import numpy as np
+import pytest
+
+# Get the absolute path of the project root
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, project_root)
+
+from simulator.metrics import step_response_metrics
+
+
+def test_step_response_metrics_of_known_trajectory():
+    time = np.arange(0, 10, 0.01)
+    reference = np.full_like(time, 2.0)
+    # Linear ramp from 0 to 2.2 over 2.2 s, then settle back to 2.0 at t = 4 s
+    position = np.interp(time, [0, 2.2, 4, 10], [0, 2.2, 2.0, 2.0])
+    force = np.where(time < 1, 10.0, 1.0)
+
+    metrics = step_response_metrics(
+        time, reference, position, force, control_saturation=10, initial_position=0
+    )
+
+    assert metrics["overshoot_percent"] == pytest.approx(10, abs=0.1)
+    # 10% to 90% of a 2 m step at 1 m/s
+    assert metrics["rise_time"] == pytest.approx(1.6, abs=0.02)
+    # Leaves the 2% band (2.04 m) on the way back down at t = 3.64 s
+    assert metrics["settling_time"] == pytest.approx(3.64, abs=0.02)
+    assert metrics["peak_saturation"] == pytest.approx(1)
+    assert metrics["saturated_fraction"] == pytest.approx(0.1)
+    assert metrics["iae"] > 0
+    assert metrics["ise"] > 0
+
+
+def test_step_response_metrics_batches_and_unsettled_runs():
+    time = np.arange(0, 5, 0.1)
+    reference = np.ones_like(time)
+    position = np.stack([np.ones_like(time), np.zeros_like(time)])
+
+    metrics = step_response_metrics(
+        time, reference, position, 0.0, control_saturation=1, initial_position=0
+    )
+
+    assert metrics["iae"].shape == (2,)
+    assert metrics["iae"] == pytest.approx([0, 5])
+    assert metrics["settling_time"][0] == 0
+    assert np.isnan(metrics["settling_time"][1])
+    assert np.isnan(metrics["rise_time"][1])
@@ -1,10 +1,13 @@
 import os
 import sys
+import numpy as np
 import pytest
 
 # Get the absolute path of the project root
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 sys.path.insert(0, project_root)
+# Modules inside simulator/ import each other by their flat names
+sys.path.append(os.path.join(project_root, "simulator"))
 
 from simulator.model import SpringMassDamperModel
 
@@ -40,3 +43,46 @@ def test_spring_mass_damper_model_spring():
 
     position = model.compute_new_position(test_force_N, dt)
     assert pytest.approx(position, abs=0.005) == 1
+
+
+def test_spring_mass_damper_model_zoh_is_exact_for_free_mass():
+    test_mass_kg = 1
+    test_force_N = 2
+    model = SpringMassDamperModel(test_mass_kg, 0, 0, 0, 0, 100, integrator="zoh")
+
+    dt = 0.5
+
+    expected_position = test_force_N / test_mass_kg * dt**2 / 2
+    assert pytest.approx(model.compute_new_position(test_force_N, dt)) == (
+        expected_position
+    )
+    assert pytest.approx(model.get_velocity()) == test_force_N / test_mass_kg * dt
+
+
+def test_spring_mass_damper_model_zoh_matches_euler():
+    euler = SpringMassDamperModel(1.5, 0.3, 1, 0.15, 4, 8)
+    zoh = SpringMassDamperModel(1.5, 0.3, 1, 0.15, 4, 8, integrator="zoh")
+
+    dt = 1 / 60
+    for frame in range(120):
+        force = 5 * np.sin(frame / 30)
+        euler_position = euler.compute_new_position(force, dt, num_steps=2000)
+        zoh_position = zoh.compute_new_position(force, dt)
+        assert pytest.approx(zoh_position, abs=1e-3) == euler_position
+
+
+def test_spring_mass_damper_model_zoh_cache_is_bounded():
+    model = SpringMassDamperModel(
+        1, 1, 100, 0.1, 0, 100, integrator="zoh", transition_cache_size=4
+    )
+
+    dt = 0.01
+    for _ in range(20):
+        model.compute_new_position(0, dt)
+    # the spring is unclamped, so every frame reuses the same matrices
+    assert model.transition_cache.misses == 1
+    assert model.transition_cache.hits == 19
+
+    for i in range(10):
+        model.compute_new_position(0, dt * (i + 2))
+    assert len(model.transition_cache) == 4
@@ -0,0 +1,93 @@
+import os
+import sys
+import numpy as np
+
+# Render off-screen so the tests run without a display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# Get the absolute path of the project root
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, project_root)
+# Modules inside simulator/ import each other by their flat names
+sys.path.append(os.path.join(project_root, "simulator"))
+
+import pygame
+from renderer import Renderer, TextCache
+
+
+class FakeFont:
+    def __init__(self):
+        self.rendered = []
+
+    def render(self, text, antialias, color):
+        self.rendered.append(text)
+        return object()
+
+    def get_linesize(self):
+        return 17
+
+
+def test_text_cache_reuses_surfaces():
+    font = FakeFont()
+    cache = TextCache(font)
+
+    first = cache.render("Kp: 1.00", True, (0, 0, 0))
+    second = cache.render("Kp: 1.00", True, (0, 0, 0))
+    other_colour = cache.render("Kp: 1.00", True, (255, 0, 0))
+
+    assert first is second
+    assert other_colour is not first
+    assert font.rendered == ["Kp: 1.00", "Kp: 1.00"]
+    assert cache.hits == 1
+    assert cache.misses == 2
+    assert cache.get_linesize() == 17
+
+
+def test_text_cache_evicts_least_recently_used():
+    font = FakeFont()
+    cache = TextCache(font, max_size=2)
+
+    cache.render("a", True, (0, 0, 0))
+    cache.render("b", True, (0, 0, 0))
+    cache.render("a", True, (0, 0, 0))
+    cache.render("c", True, (0, 0, 0))
+    cache.render("a", True, (0, 0, 0))
+    cache.render("b", True, (0, 0, 0))
+
+    assert len(cache.surfaces) == 2
+    assert font.rendered == ["a", "b", "c", "b"]
+
+
+def render_frames(dirty_rects):
+    renderer = Renderer(length_m=8, width=800, height=900, dirty_rects=dirty_rects)
+    for i in range(120):
+        t = i / 60
+        renderer.plot(["Reference", "Position"], [6, 4 + np.sin(t)], t)
+        renderer.set_object_state(4 + np.sin(t))
+        if i == 60:
+            renderer.slider_kp.value = 2.0
+            renderer.slider_kp.update_handle_position()
+        renderer.update()
+    return pygame.surfarray.array3d(renderer.screen)
+
+
+def test_dirty_rect_mode_matches_full_redraw():
+    full = render_frames(dirty_rects=False)
+    dirty = render_frames(dirty_rects=True)
+
+    assert np.array_equal(full, dirty)
+
+
+def test_static_layer_is_rebuilt_on_layout_change():
+    renderer = Renderer(length_m=8, width=800, height=900)
+    renderer.plot(["Position"], [1.0], 0.0)
+    renderer.update()
+    background = renderer.background
+
+    renderer.plot(["Position"], [2.0], 0.1)
+    renderer.update()
+    assert renderer.background is background
+
+    renderer.plot(["Position", "Force"], [2.0, 1.0], 0.2)
+    renderer.update()
+    assert renderer.background is not background
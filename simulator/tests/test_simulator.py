@@ -0,0 +1,64 @@
+import os
+import sys
+import numpy as np
+import pytest
+
+# Get the absolute path of the project root
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, project_root)
+# Modules inside simulator/ import each other by their flat names
+sys.path.append(os.path.join(project_root, "simulator"))
+
+from model import SpringMassDamperModel
+from controller_solution import Controller
+from simulator.simulator import Simulator, step_schedule
+
+
+def make_simulator(white_noise_percent=0):
+    model = SpringMassDamperModel(
+        mass=1.5,
+        k_spring=0.3,
+        max_spring_force_N=1,
+        b_damper=0.15,
+        midpos_m=4,
+        control_saturation=8,
+        integrator="zoh",
+    )
+    return Simulator(Controller(), model, None, 8, white_noise_percent)
+
+
+def test_headless_run_tracks_reference():
+    simulator = make_simulator()
+
+    trajectory = simulator.run_headless(30, 6, (2, 0.5, 1))
+
+    assert len(trajectory["time"]) == 30 * simulator.fps
+    assert trajectory["time"][1] == pytest.approx(simulator.dt)
+    assert np.all(trajectory["reference"] == 6)
+    assert trajectory["position"][-1] == pytest.approx(6, abs=0.01)
+    assert np.all(np.abs(trajectory["force"]) <= 8)
+
+
+def test_headless_run_follows_schedules():
+    simulator = make_simulator()
+    reference = step_schedule([(0, 4.0), (5, 6.0)])
+    gains = step_schedule([(0, (1, 0, 0)), (2, (2, 0.5, 1))])
+
+    trajectory = simulator.run_headless(20, reference, gains)
+
+    time = trajectory["time"]
+    assert np.all(trajectory["reference"][time < 5] == 4)
+    assert np.all(trajectory["reference"][time >= 5] == 6)
+    assert np.all(trajectory["kp"][time < 2] == 1)
+    assert np.all(trajectory["kp"][time >= 2] == 2)
+    assert trajectory["position"][-1] == pytest.approx(6, abs=0.05)
+
+
+def test_step_schedule_holds_values():
+    schedule = step_schedule([(5, "b"), (0, "a")])
+
+    assert schedule(-1) == "a"
+    assert schedule(0) == "a"
+    assert schedule(4.9) == "a"
+    assert schedule(5) == "b"
+    assert schedule(100) == "b"
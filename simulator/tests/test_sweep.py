@@ -0,0 +1,44 @@
+import os
+import sys
+import numpy as np
+import pytest
+
+# Get the absolute path of the project root
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, project_root)
+# Modules inside simulator/ import each other by their flat names
+sys.path.append(os.path.join(project_root, "simulator"))
+
+from sweep import TABLE_COLUMNS, gain_grid, sweep_gains
+
+
+def test_gain_grid_covers_every_combination():
+    candidates = gain_grid([0, 1], [0, 0.5, 1], [2])
+
+    assert candidates.shape == (6, 3)
+    assert {tuple(c) for c in candidates} == {
+        (kp, ki, 2) for kp in (0, 1) for ki in (0, 0.5, 1)
+    }
+
+
+def test_sweep_ranks_better_gains_first():
+    candidates = [(0.5, 0, 0), (3, 0.5, 2), (0, 0, 0)]
+
+    table = sweep_gains(candidates, 6, 20, processes=2, chunk_size=1)
+
+    assert set(table) == set(TABLE_COLUMNS)
+    assert np.argmin(table["iae"]) == 1
+    # Without any gain the plant never moves towards the reference
+    assert np.isnan(table["rise_time"][2])
+    assert table["peak_saturation"][2] == 0
+    assert table["settling_time"][1] < 10
+
+
+def test_sweep_matches_serial_run():
+    candidates = gain_grid([1, 2], [0.2], [1])
+
+    parallel = sweep_gains(candidates, 6, 5, processes=2, chunk_size=1)
+    serial = sweep_gains(candidates, 6, 5, processes=1)
+
+    for name in TABLE_COLUMNS:
+        assert parallel[name] == pytest.approx(serial[name], nan_ok=True)
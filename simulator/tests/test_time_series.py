@@ -0,0 +1,73 @@
+import os
+import sys
+import numpy as np
+
+# Get the absolute path of the project root
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, project_root)
+
+from simulator.time_series import TimeSeriesBuffer, min_max_decimate
+
+
+def test_buffer_keeps_latest_samples_in_order():
+    buffer = TimeSeriesBuffer(capacity=4)
+
+    for i in range(10):
+        buffer.append(i * 0.1, i)
+
+    assert len(buffer) == 4
+    assert list(buffer.values) == [6, 7, 8, 9]
+    assert np.allclose(buffer.times, [0.6, 0.7, 0.8, 0.9])
+
+
+def test_buffer_views_are_contiguous_and_not_copies():
+    buffer = TimeSeriesBuffer(capacity=5)
+
+    for i in range(13):
+        buffer.append(i, i)
+        assert list(buffer.values) == list(range(max(0, i - 4), i + 1))
+        assert buffer.values.base is not None
+        assert buffer.times.flags["C_CONTIGUOUS"]
+
+
+def test_buffer_evicts_by_time():
+    buffer = TimeSeriesBuffer(capacity=100)
+
+    for i in range(20):
+        buffer.append(i, -i)
+    buffer.evict_before(15)
+
+    assert list(buffer.times) == [15, 16, 17, 18, 19]
+
+    buffer.evict_before(100)
+    assert len(buffer) == 0
+
+    buffer.append(100, 1)
+    assert list(buffer.values) == [1]
+
+
+def test_min_max_decimate_bounds_points_and_keeps_spikes():
+    times = np.linspace(0, 10, 100000)
+    values = np.sin(times)
+    values[54321] = 25.0
+    values[12345] = -25.0
+    width_px = 500
+
+    x, decimated = min_max_decimate(times, values, 0, 10, width_px)
+
+    assert len(x) == len(decimated)
+    assert len(x) <= 2 * (width_px + 1)
+    assert decimated.max() == 25.0
+    assert decimated.min() == -25.0
+    assert np.all(np.diff(x) >= 0)
+    assert x.min() >= 0 and x.max() <= width_px
+
+
+def test_min_max_decimate_passes_short_series_through():
+    times = np.array([0.0, 1.0, 2.0])
+    values = np.array([1.0, 2.0, 3.0])
+
+    x, decimated = min_max_decimate(times, values, 0, 2, 100)
+
+    assert list(x) == [0, 50, 100]
+    assert list(decimated) == [1, 2, 3]
@@ -0,0 +1,86 @@
+import numpy as np
+
+
+class TimeSeriesBuffer:
+    """
+    A fixed-capacity circular buffer of (time, value) samples.
+
+    Appending and evicting are O(1) and never allocate. Every sample is
+    written twice, at slot i and at slot i + capacity, so the samples
+    currently held are always one contiguous slice of the storage and
+    the times and values properties can return views instead of copies.
+    Samples must be appended in non-decreasing time order.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._times = np.zeros(2 * capacity)
+        self._values = np.zeros(2 * capacity)
+        # Logical indices of the oldest sample and one past the newest
+        self._start = 0
+        self._end = 0
+
+    def __len__(self):
+        return self._end - self._start
+
+    def append(self, time_now, value):
+        """Adds a sample, dropping the oldest one if the buffer is full."""
+        if self._end - self._start == self.capacity:
+            self._start += 1
+        slot = self._end % self.capacity
+        self._times[slot] = self._times[slot + self.capacity] = time_now
+        self._values[slot] = self._values[slot + self.capacity] = value
+        self._end += 1
+
+    def evict_before(self, min_time):
+        """Drops samples older than min_time (amortized O(1) per sample)."""
+        while (
+            self._start < self._end
+            and self._times[self._start % self.capacity] < min_time
+        ):
+            self._start += 1
+
+    def clear(self):
+        self._start = self._end = 0
+
+    @property
+    def times(self):
+        """Sample times, oldest first. A view, valid until the next append."""
+        offset = self._start % self.capacity
+        return self._times[offset : offset + len(self)]
+
+    @property
+    def values(self):
+        """Sample values, oldest first. A view, valid until the next append."""
+        offset = self._start % self.capacity
+        return self._values[offset : offset + len(self)]
+
+
+def min_max_decimate(times, values, min_time, time_range, width_px):
+    """
+    Reduces a series to at most two points per pixel column for drawing.
+
+    Samples are binned by the pixel column their time falls in, and each
+    column keeps its minimum and maximum value, so short spikes (e.g. noise)
+    stay visible however many samples share a column. The pair is ordered
+    so that it starts at the extreme nearer the column's first sample,
+    which keeps the drawn line continuous.
+    :return: (x in pixels from the left of the plot, values), both arrays
+    """
+    x = (times - min_time) * (width_px / time_range)
+    if len(values) <= 2 * width_px:
+        return x, values
+
+    columns = np.clip(x.astype(np.int64), 0, int(width_px))
+    starts = np.flatnonzero(np.diff(columns)) + 1
+    starts = np.concatenate(([0], starts))
+    mins = np.minimum.reduceat(values, starts)
+    maxs = np.maximum.reduceat(values, starts)
+
+    first = values[starts]
+    max_first = (maxs - first) < (first - mins)
+    decimated_values = np.empty(2 * len(starts))
+    decimated_values[0::2] = np.where(max_first, maxs, mins)
+    decimated_values[1::2] = np.where(max_first, mins, maxs)
+    decimated_x = np.repeat(columns[starts].astype("float64"), 2)
+    return decimated_x, decimated_values